@@ -36,14 +36,55 @@ def main():
         default="INFO",
         help="Logging level (default: INFO)"
     )
+    parser.add_argument(
+        "--backend",
+        choices=["openai", "offline"],
+        default=None,
+        help="Generation backend (default: processing.backend in config)"
+    )
+    parser.add_argument(
+        "--skip-existing",
+        action="store_true",
+        help="Skip titles that already have an article in the output directory"
+    )
+    parser.add_argument(
+        "--max-age-days",
+        type=int,
+        default=None,
+        help="With --skip-existing, regenerate articles older than this many days"
+    )
+    parser.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="Rebuild the output directory index before running"
+    )
+    parser.add_argument(
+        "--trace-dir",
+        type=str,
+        default=None,
+        help="Write per-title span traces (Chrome trace-event and OTLP JSON) to this directory"
+    )
     
     args = parser.parse_args()
     
+    if args.max_age_days is not None and not args.skip_existing:
+        parser.error("--max-age-days requires --skip-existing")
+    
     logger = setup_logger(args.log_level)
     
     try:
         config_manager = ConfigManager(args.config)
-        cli = CLIInterface(config_manager, args.outdir, logger)
+        if args.backend:
+            config_manager.set('processing.backend', args.backend)
+        cli = CLIInterface(
+            config_manager,
+            args.outdir,
+            logger,
+            skip_existing=args.skip_existing,
+            max_age_days=args.max_age_days,
+            rebuild_index=args.rebuild_index,
+            trace_dir=args.trace_dir
+        )
         cli.run()
     except KeyboardInterrupt:
         logger.info("Process interrupted by user")
@@ -0,0 +1,61 @@
+"""Generation backend interface for BlogAutoWriter."""
+
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, Any
+
+from .tracing import Tracer
+
+
+class GenerationBackend(ABC):
+    """Base class for article generation backends.
+    
+    Backends turn a prompt template and title into markdown content. They
+    return None when no article could be produced, honouring ``deadline``
+    (a ``time.monotonic()`` value) and ``abort_event`` where they block.
+    Running out of time raises ``TimeoutError``.
+    """
+    
+    name = "base"
+    
+    def __init__(self, config: Dict[str, Any], logger: logging.Logger, tracer: Optional[Tracer] = None):
+        self.config = config
+        self.logger = logger
+        self.tracer = tracer or Tracer(enabled=False)
+    
+    @abstractmethod
+    def generate_article(
+        self,
+        prompt: str,
+        title: str,
+        deadline: Optional[float] = None,
+        abort_event: Optional[threading.Event] = None
+    ) -> Optional[str]:
+        """Generate article content for ``title``."""
+    
+    def test_connection(self) -> bool:
+        """Check that the backend is ready to generate articles."""
+        return True
+    
+    def save_stats(self):
+        """Persist any statistics collected during the run."""
+
+
+def create_backend(
+    config: Dict[str, Any],
+    logger: logging.Logger,
+    tracer: Optional[Tracer] = None
+) -> GenerationBackend:
+    """Create the backend selected by ``processing.backend``."""
+    backend = config.get('processing', {}).get('backend', 'openai')
+    
+    # Imported lazily so the offline backend works without the openai package.
+    if backend == 'openai':
+        from .openai_client import OpenAIClient
+        return OpenAIClient(config, logger, tracer)
+    if backend == 'offline':
+        from .offline_backend import OfflineBackend
+        return OfflineBackend(config, logger, tracer)
+    
+    raise ValueError(f"不明な生成バックエンドです: {backend}")
@@ -1,25 +1,43 @@
 """CLI interface for BlogAutoWriter."""
 
+import os
 import sys
 from pathlib import Path
-from typing import List, Set
+from typing import List, Set, Optional
 import logging
+from datetime import datetime
 
 from .config import ConfigManager
 from .generator import ArticleGenerator
-from .utils import validate_title, create_title_slug
+from .output_index import OutputIndex
+from .tracing import Tracer
+from .utils import validate_title, create_title_slug, create_output_filename
 
 
 class CLIInterface:
     """Command-line interface for BlogAutoWriter."""
     
-    def __init__(self, config_manager: ConfigManager, output_dir: str, logger: logging.Logger):
+    def __init__(
+        self,
+        config_manager: ConfigManager,
+        output_dir: str,
+        logger: logging.Logger,
+        skip_existing: bool = False,
+        max_age_days: Optional[int] = None,
+        rebuild_index: bool = False,
+        trace_dir: Optional[str] = None
+    ):
         self.config_manager = config_manager
         self.output_dir = Path(output_dir)
         self.logger = logger
-        self.generator = ArticleGenerator(config_manager, logger)
+        self.skip_existing = skip_existing
+        self.max_age_days = max_age_days
+        self.trace_dir = Path(trace_dir) if trace_dir else None
+        self.tracer = Tracer(enabled=self.trace_dir is not None)
+        self.generator = ArticleGenerator(config_manager, logger, self.tracer)
         
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.output_index = OutputIndex(self.output_dir, logger, rebuild=rebuild_index)
     
     def run(self):
         """Run the CLI application."""
@@ -33,6 +51,12 @@ class CLIInterface:
                 self.logger.warning("タイトルが入力されませんでした")
                 return
             
+            titles = self._filter_existing(titles)
+            
+            if not titles:
+                print("生成対象のタイトルがありません。")
+                return
+            
             self._confirm_generation(titles)
             self._generate_articles(titles)
             
@@ -46,6 +70,7 @@ class CLIInterface:
     def _display_config(self):
         """Display current configuration."""
         print("=== BlogAutoWriter 設定 ===")
+        print(f"バックエンド: {self.generator.backend.name}")
         print(f"モデル: {self.config_manager.get('openai.model')}")
         print(f"文体: {self.config_manager.get('prompt_settings.style')}")
         print(f"対象読者: {self.config_manager.get('prompt_settings.target_audience')}")
@@ -103,6 +128,38 @@ class CLIInterface:
         print(f"\n合計 {len(titles)} 件のタイトルが入力されました。")
         return titles
     
+    def _filter_existing(self, titles: List[str]) -> List[str]:
+        """Drop titles whose file name is taken and titles that already have articles."""
+        remaining = []
+        batch_slugs = {}
+        
+        for title in titles:
+            slug = create_title_slug(title)
+            if slug in batch_slugs:
+                print(f"エラー: 「{title}」は「{batch_slugs[slug]}」と同じファイル名になるため除外します")
+                continue
+            
+            owner = self.output_index.file_owner(title, create_output_filename(title))
+            if owner is not None:
+                print(f"エラー: 「{title}」は本日生成された「{owner}」と同じファイル名になるため除外します")
+                continue
+            
+            for other_title in self.output_index.colliding_titles(title):
+                print(f"警告: 「{title}」のファイル名が既存記事「{other_title}」と重複します")
+            
+            entry = self.output_index.lookup_existing(title) if self.skip_existing else None
+            if entry:
+                age = self.output_index.age_days(title)
+                if self.max_age_days is None or age <= self.max_age_days:
+                    print(f"スキップ: {title} (既存: {entry['filename']})")
+                    self.logger.info(f"既存記事があるためスキップしました: {title}")
+                    continue
+            
+            batch_slugs[slug] = title
+            remaining.append(title)
+        
+        return remaining
+    
     def _confirm_generation(self, titles: List[str]):
         """Confirm article generation with user."""
         print("\n=== 生成対象タイトル ===")
@@ -129,7 +186,7 @@ class CLIInterface:
         self.logger.info(f"{len(titles)} 件の記事生成を開始します")
         
         try:
-            results = self.generator.generate_articles(titles, self.output_dir)
+            results = self.generator.generate_articles(titles, self.output_dir, self.output_index)
             
             print("\n=== 生成結果 ===")
             successful = 0
@@ -153,7 +210,32 @@ class CLIInterface:
             
             self.logger.info(f"記事生成完了: 成功 {successful} 件, 失敗 {failed} 件")
             
+            self._export_trace()
+            
+            if self.generator.aborted:
+                # Worker threads may still be blocked on API calls; do not wait for them.
+                sys.stdout.flush()
+                logging.shutdown()
+                os._exit(130)
+            
         except Exception as e:
+            self._export_trace()
             self.logger.error(f"記事生成中にエラーが発生しました: {e}")
             print(f"エラー: {e}")
-            sys.exit(1)
\ No newline at end of file
+            sys.exit(1)
+    
+    def _export_trace(self):
+        """Export the run trace as Chrome trace-event and OTLP JSON files."""
+        if self.trace_dir is None:
+            return
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        chrome_path = self.trace_dir / f"trace_{timestamp}.json"
+        otlp_path = self.trace_dir / f"trace_{timestamp}.otlp.json"
+        
+        try:
+            self.tracer.export_chrome(chrome_path)
+            self.tracer.export_otlp(otlp_path)
+            print(f"トレースを保存しました: {chrome_path}, {otlp_path}")
+        except Exception as e:
+            self.logger.warning(f"トレースの保存に失敗しました: {e}")
\ No newline at end of file
@@ -22,12 +22,24 @@ class ConfigManager:
         "openai": {
             "model": "o4-mini",
             "temperature": 0.7,
-            "max_tokens": 1000
+            "max_tokens": 1000,
+            "auto_max_tokens": True,
+            "token_safety_margin": 1.3,
+            "max_tokens_limit": 16000,
+            "token_stats_path": "token_stats.json"
         },
         "processing": {
             "max_threads": 10,
             "retry_attempts": 3,
-            "retry_delay": 1.0
+            "retry_delay": 1.0,
+            "backend": "openai",
+            "drain_timeout": 30.0,
+            "title_timeout": None,
+            "run_timeout": None
+        },
+        "offline": {
+            "seed": 0,
+            "latency": 0.0
         }
     }
     
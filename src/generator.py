@@ -1,110 +1,363 @@
 """Article generation logic for BlogAutoWriter."""
 
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, Future
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from datetime import datetime
 
 from .config import ConfigManager
-from .openai_client import OpenAIClient
+from .backend import GenerationBackend, create_backend
+from .output_index import OutputIndex
+from .tracing import Tracer, Span
 from .utils import create_output_filename, sanitize_markdown_content
 from .logger import log_title_processing
 
 
 class ArticleGenerator:
-    """Handles article generation with parallel processing."""
+    """Handles article generation with parallel processing.
     
-    def __init__(self, config_manager: ConfigManager, logger: logging.Logger):
+    The first ``KeyboardInterrupt`` received while articles are being
+    generated sets ``stop_event`` so no new titles are started, and drains
+    in-flight requests for up to ``processing.drain_timeout`` seconds. A
+    second interrupt, the end of the drain or ``processing.run_timeout``
+    sets ``abort_event``, which backends watch to abandon in-flight work.
+    ``aborted`` is set when requests were left running, so the caller should
+    exit without waiting on them.
+    """
+    
+    def __init__(
+        self,
+        config_manager: ConfigManager,
+        logger: logging.Logger,
+        tracer: Optional[Tracer] = None,
+        backend: Optional[GenerationBackend] = None
+    ):
         self.config_manager = config_manager
         self.logger = logger
-        self.openai_client = OpenAIClient(config_manager.config, logger)
+        self.tracer = tracer or Tracer(enabled=False)
+        self.backend = backend or create_backend(config_manager.config, logger, self.tracer)
         self.max_threads = config_manager.get('processing.max_threads', 10)
+        self.drain_timeout = config_manager.get('processing.drain_timeout', 30.0)
+        self.title_timeout = config_manager.get('processing.title_timeout')
+        self.run_timeout = config_manager.get('processing.run_timeout')
+        self.stop_event = threading.Event()
+        self.abort_event = threading.Event()
+        self.aborted = False
+        self._claimed_files: Dict[str, str] = {}
+        self._claim_lock = threading.Lock()
+    
+    def cancel(self):
+        """Stop starting new titles; in-flight titles keep running."""
+        self.stop_event.set()
     
-    def generate_articles(self, titles: List[str], output_dir: Path) -> Dict[str, Dict[str, Any]]:
-        """Generate articles for multiple titles in parallel."""
+    def abort(self):
+        """Stop starting new titles and abandon in-flight ones."""
+        self.stop_event.set()
+        self.abort_event.set()
+    
+    def generate_articles(
+        self,
+        titles: List[str],
+        output_dir: Path,
+        output_index: Optional[OutputIndex] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Generate articles for multiple titles in parallel.
+        
+        Written articles are recorded in ``output_index`` when given.
+        """
         results = {}
+        self.stop_event.clear()
+        self.abort_event.clear()
+        self.aborted = False
+        self._claimed_files = {}
+        run_span = self.tracer.start_span(
+            'run',
+            titles=len(titles),
+            max_threads=self.max_threads,
+            backend=self.backend.name
+        )
         
-        if not self.openai_client.test_connection():
-            raise RuntimeError("OpenAI API接続に失敗しました")
+        with self.tracer.use_span(run_span), self.tracer.span('test_connection'):
+            connected = self.backend.test_connection()
+        if not connected:
+            self.tracer.end_span(run_span, error='connection failed')
+            raise RuntimeError(f"生成バックエンド ({self.backend.name}) の接続に失敗しました")
         
         prompt_template = self.config_manager.get_prompt_template()
+        run_deadline = time.monotonic() + self.run_timeout if self.run_timeout else None
         
-        with ThreadPoolExecutor(max_workers=self.max_threads) as executor:
-            future_to_title = {
-                executor.submit(
-                    self._generate_single_article, 
-                    title, 
-                    prompt_template, 
-                    output_dir
-                ): title 
-                for title in titles
-            }
-            
-            for future in as_completed(future_to_title):
-                title = future_to_title[future]
-                
-                try:
-                    result = future.result()
-                    results[title] = result
-                    
-                    if result['success']:
-                        log_title_processing(
-                            self.logger, 
-                            title, 
-                            'completed',
-                            output_file=result['output_file']
-                        )
-                    else:
-                        log_title_processing(
-                            self.logger, 
-                            title, 
-                            'failed',
-                            error=result['error']
-                        )
-                        
-                except Exception as e:
-                    error_msg = f"予期しないエラー: {e}"
-                    results[title] = {
-                        'success': False,
-                        'error': error_msg,
-                        'output_file': None
-                    }
-                    log_title_processing(
-                        self.logger, 
+        executor = ThreadPoolExecutor(max_workers=self.max_threads)
+        future_to_title: Dict[Future, str] = {}
+        try:
+            try:
+                for title in titles:
+                    queue_span = self.tracer.start_span('queued', parent=run_span, title=title)
+                    future = executor.submit(
+                        self._generate_single_article, 
                         title, 
-                        'failed',
-                        error=error_msg
+                        prompt_template, 
+                        output_dir,
+                        run_deadline,
+                        output_index,
+                        run_span,
+                        queue_span
                     )
+                    future_to_title[future] = title
+                
+                self._collect_results(future_to_title, results, run_deadline)
+            except FuturesTimeoutError:
+                self.logger.warning("実行全体の制限時間を超過しました。未処理の記事生成を中止します")
+                self.abort()
+                self._finish_pending(titles, future_to_title, results, '実行全体の制限時間を超過しました')
+            except KeyboardInterrupt:
+                self.logger.warning(
+                    f"中断要求を受信しました。実行中の記事生成を最大 {self.drain_timeout} 秒待機します "
+                    "(再度中断すると即時終了します)"
+                )
+                self._drain(titles, future_to_title, results, 'ユーザーによって中断されました', run_deadline)
+        finally:
+            executor.shutdown(wait=not self.abort_event.is_set())
+            self.tracer.end_span(run_span, cancelled=self.stop_event.is_set())
+            self.tracer.end_open_spans(cancelled=True)
+            self.backend.save_stats()
+            if output_index is not None:
+                output_index.save()
         
         return results
     
+    def _drain(
+        self,
+        titles: List[str],
+        future_to_title: Dict[Future, str],
+        results: Dict[str, Dict[str, Any]],
+        reason: str,
+        run_deadline: Optional[float]
+    ):
+        """Stop dispatching and wait for in-flight articles up to the drain timeout."""
+        self.cancel()
+        self._cancel_pending(future_to_title, results, reason)
+        
+        drain_deadline = time.monotonic() + self.drain_timeout
+        if run_deadline is not None:
+            drain_deadline = min(drain_deadline, run_deadline)
+        try:
+            self._collect_results(future_to_title, results, drain_deadline)
+        except FuturesTimeoutError:
+            self.logger.warning("待機時間内に完了しなかった記事生成を破棄します")
+        except KeyboardInterrupt:
+            self.logger.warning("再度の中断要求を受信しました。即時終了します")
+        
+        self._finish_pending(titles, future_to_title, results, reason)
+    
+    def _finish_pending(
+        self,
+        titles: List[str],
+        future_to_title: Dict[Future, str],
+        results: Dict[str, Dict[str, Any]],
+        reason: str
+    ):
+        """Abandon every title without a result, including ones never submitted.
+        
+        Futures that finished after the wait ended keep their real result.
+        """
+        for future, title in future_to_title.items():
+            if title in results:
+                continue
+            
+            if future.done() and not future.cancelled():
+                self._record_result(future, title, results)
+                continue
+            
+            if not future.cancel():
+                self.abort()
+                self.aborted = True
+            self._record_failure(results, title, reason)
+        
+        for title in titles:
+            if title not in results:
+                self._record_failure(results, title, reason)
+    
+    def _cancel_pending(
+        self,
+        future_to_title: Dict[Future, str],
+        results: Dict[str, Dict[str, Any]],
+        reason: str
+    ):
+        """Cancel futures that have not started yet."""
+        for future, title in future_to_title.items():
+            if title not in results and future.cancel():
+                self._record_failure(results, title, reason)
+    
+    def _collect_results(
+        self,
+        future_to_title: Dict[Future, str],
+        results: Dict[str, Dict[str, Any]],
+        deadline: Optional[float]
+    ):
+        """Record results of finished futures until all are done or the deadline passes."""
+        pending = [future for future, title in future_to_title.items() if title not in results]
+        timeout = max(deadline - time.monotonic(), 0) if deadline is not None else None
+        
+        for future in as_completed(pending, timeout=timeout):
+            title = future_to_title[future]
+            
+            if future.cancelled():
+                if title not in results:
+                    self._record_failure(results, title, '記事生成がキャンセルされました')
+                continue
+            
+            self._record_result(future, title, results)
+    
+    def _record_result(self, future: Future, title: str, results: Dict[str, Dict[str, Any]]):
+        """Record and log the result of a finished future."""
+        try:
+            result = future.result()
+            results[title] = result
+            
+            if result['success']:
+                log_title_processing(
+                    self.logger, 
+                    title, 
+                    'completed',
+                    output_file=result['output_file']
+                )
+            else:
+                log_title_processing(
+                    self.logger, 
+                    title, 
+                    'failed',
+                    error=result['error']
+                )
+                
+        except Exception as e:
+            self._record_failure(results, title, f"予期しないエラー: {e}")
+    
+    def _record_failure(self, results: Dict[str, Dict[str, Any]], title: str, error_msg: str):
+        """Record and log a failed title."""
+        results[title] = {
+            'success': False,
+            'error': error_msg,
+            'output_file': None
+        }
+        log_title_processing(
+            self.logger, 
+            title, 
+            'failed',
+            error=error_msg
+        )
+    
     def _generate_single_article(
         self, 
         title: str, 
         prompt_template: str, 
-        output_dir: Path
+        output_dir: Path,
+        run_deadline: Optional[float] = None,
+        output_index: Optional[OutputIndex] = None,
+        run_span: Optional[Span] = None,
+        queue_span: Optional[Span] = None
+    ) -> Dict[str, Any]:
+        """Generate a single article, tracing it as an ``article`` span on this worker."""
+        if queue_span is not None:
+            self.tracer.end_span(queue_span)
+        article_span = self.tracer.start_span('article', parent=run_span, title=title)
+        self.tracer.add_event('dispatched', span=article_span, title=title)
+        
+        with self.tracer.use_span(article_span):
+            result = self._run_single_article(title, prompt_template, output_dir, run_deadline, output_index)
+        
+        self.tracer.end_span(article_span, success=result['success'], error=result['error'])
+        return result
+    
+    def _claim_output_file(
+        self,
+        title: str,
+        filename: str,
+        output_index: Optional[OutputIndex]
+    ) -> Optional[str]:
+        """Reserve ``filename`` for ``title``.
+        
+        Returns the title that already owns the file, in this run or in the
+        index, so that articles never overwrite each other.
+        """
+        with self._claim_lock:
+            owner = self._claimed_files.get(filename)
+            if owner is None and output_index is not None:
+                owner = output_index.file_owner(title, filename)
+            if owner is not None and owner != title:
+                return owner
+            
+            self._claimed_files[filename] = title
+            return None
+    
+    def _run_single_article(
+        self,
+        title: str,
+        prompt_template: str,
+        output_dir: Path,
+        run_deadline: Optional[float],
+        output_index: Optional[OutputIndex]
     ) -> Dict[str, Any]:
-        """Generate a single article."""
+        """Request, sanitize and write a single article."""
+        if self.stop_event.is_set():
+            return {
+                'success': False,
+                'error': 'ユーザーによって中断されました',
+                'output_file': None
+            }
+        
         log_title_processing(self.logger, title, 'started')
         
+        filename = create_output_filename(title)
+        owner = self._claim_output_file(title, filename, output_index)
+        if owner is not None:
+            return {
+                'success': False,
+                'error': f"出力ファイル名 {filename} が「{owner}」と重複します",
+                'output_file': None
+            }
+        
+        deadline = run_deadline
+        if self.title_timeout:
+            title_deadline = time.monotonic() + self.title_timeout
+            deadline = min(deadline, title_deadline) if deadline is not None else title_deadline
+        
         try:
-            content = self.openai_client.generate_article(prompt_template, title)
+            with self.tracer.span('generate', title=title):
+                content = self.backend.generate_article(
+                    prompt_template,
+                    title,
+                    deadline=deadline,
+                    abort_event=self.abort_event
+                )
             
             if not content:
+                if deadline is not None and time.monotonic() >= deadline:
+                    error = '制限時間を超過しました'
+                elif self.abort_event.is_set():
+                    error = 'ユーザーによって中断されました'
+                else:
+                    error = f'生成バックエンド ({self.backend.name}) から有効な応答を取得できませんでした'
                 return {
                     'success': False,
-                    'error': 'OpenAI APIから有効な応答を取得できませんでした',
+                    'error': error,
                     'output_file': None
                 }
             
-            sanitized_content = sanitize_markdown_content(content)
+            with self.tracer.span('sanitize', title=title):
+                sanitized_content = sanitize_markdown_content(content)
             
-            filename = create_output_filename(title)
             output_file = output_dir / filename
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(sanitized_content)
+            with self.tracer.span('write', title=title, output_file=str(output_file)):
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    f.write(sanitized_content)
+                
+                if output_index is not None:
+                    output_index.record(title, output_file, sanitized_content)
             
             return {
                 'success': True,
@@ -112,6 +365,12 @@ class ArticleGenerator:
                 'output_file': str(output_file)
             }
             
+        except TimeoutError:
+            return {
+                'success': False,
+                'error': '制限時間を超過しました',
+                'output_file': None
+            }
         except Exception as e:
             return {
                 'success': False,
@@ -0,0 +1,135 @@
+"""Offline deterministic generation backend for BlogAutoWriter."""
+
+import logging
+import random
+import threading
+import time
+import zlib
+from typing import Optional, Dict, Any, List
+
+from .backend import GenerationBackend
+from .tracing import Tracer
+
+
+HEADING_TEMPLATES = [
+    "{title}とは",
+    "{title}の基本",
+    "{title}のメリット",
+    "{title}の注意点",
+    "{title}の実践方法",
+    "{title}の事例",
+    "{title}のよくある質問",
+    "{title}の今後",
+]
+
+SENTENCE_TEMPLATES = [
+    "{title}は多くの人にとって身近なテーマです。",
+    "まずは全体像を把握することが大切です。",
+    "ここでは要点を順番に整理していきます。",
+    "具体的な手順を確認しながら進めると理解が深まります。",
+    "初めての方でも取り組みやすい方法から始めましょう。",
+    "{title}について誤解されやすい点もあります。",
+    "実際の場面を想定して考えてみると分かりやすくなります。",
+    "小さな改善を積み重ねることが成果につながります。",
+    "目的を明確にしておくと判断に迷いにくくなります。",
+    "必要に応じて専門家の意見を参考にするのも有効です。",
+    "継続して見直すことで、より良い結果が期待できます。",
+    "{title}を活用する際は、状況に合わせた調整が欠かせません。",
+]
+
+SENTENCES_PER_PARAGRAPH = 3
+
+
+class OfflineBackend(GenerationBackend):
+    """Generates markdown articles locally from templates without any API.
+    
+    Output is deterministic for a given ``offline.seed`` and title and
+    follows the configured ``sections`` / ``words_per_section`` size, so the
+    rest of the pipeline can be load tested without network access.
+    ``offline.latency`` adds an artificial delay per article in seconds; it
+    is cut short only by the abort event, or by the deadline, which raises
+    ``TimeoutError``.
+    """
+    
+    name = "offline"
+    
+    def __init__(self, config: Dict[str, Any], logger: logging.Logger, tracer: Optional[Tracer] = None):
+        super().__init__(config, logger, tracer)
+        
+        article_length = config.get('prompt_settings', {}).get('article_length', {})
+        self.sections = article_length.get('sections', 3)
+        self.words_per_section = article_length.get('words_per_section', 300)
+        self.seed = config.get('offline', {}).get('seed', 0)
+        self.latency = config.get('offline', {}).get('latency', 0.0)
+    
+    def generate_article(
+        self,
+        prompt: str,
+        title: str,
+        deadline: Optional[float] = None,
+        abort_event: Optional[threading.Event] = None
+    ) -> Optional[str]:
+        """Generate article content from templates."""
+        if self.latency and not self._wait(self.latency, deadline, abort_event):
+            self.logger.info(f"中断要求により記事生成を停止しました: {title}")
+            return None
+        
+        rng = random.Random(self.seed ^ zlib.crc32(title.encode('utf-8')))
+        lines = [f"# {title}", ""]
+        
+        for section in range(self.sections):
+            heading = HEADING_TEMPLATES[section % len(HEADING_TEMPLATES)].format(title=title)
+            lines.append(f"## {heading}")
+            lines.append("")
+            for paragraph in self._section_paragraphs(rng, title):
+                lines.append(paragraph)
+                lines.append("")
+        
+        return '\n'.join(lines).strip()
+    
+    def _section_paragraphs(self, rng: random.Random, title: str) -> List[str]:
+        """Build paragraphs totalling at least ``words_per_section`` characters."""
+        paragraphs = []
+        sentences = []
+        length = 0
+        
+        while length < self.words_per_section:
+            sentence = rng.choice(SENTENCE_TEMPLATES).format(title=title)
+            sentences.append(sentence)
+            length += len(sentence)
+            if len(sentences) == SENTENCES_PER_PARAGRAPH:
+                paragraphs.append(''.join(sentences))
+                sentences = []
+        
+        if sentences:
+            paragraphs.append(''.join(sentences))
+        
+        return paragraphs
+    
+    def _wait(
+        self,
+        delay: float,
+        deadline: Optional[float],
+        abort_event: Optional[threading.Event]
+    ) -> bool:
+        """Sleep for the simulated latency. Returns False if aborted.
+        
+        Raises:
+            TimeoutError: If ``deadline`` passes before the latency elapses.
+        """
+        timed_out = False
+        if deadline is not None:
+            remaining = max(deadline - time.monotonic(), 0)
+            if remaining < delay:
+                delay = remaining
+                timed_out = True
+        
+        if abort_event is not None:
+            if abort_event.wait(delay):
+                return False
+        else:
+            time.sleep(delay)
+        
+        if timed_out:
+            raise TimeoutError("制限時間を超過しました")
+        return True
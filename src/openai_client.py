@@ -3,37 +3,91 @@
 import os
 import time
 import logging
+import threading
 import openai
 from typing import Optional, Dict, Any
 
+from .backend import GenerationBackend
+from .token_stats import TokenUsageStats
+from .tracing import Tracer
 
-class OpenAIClient:
+
+class OpenAIClient(GenerationBackend):
     """OpenAI API client with retry logic and error handling."""
     
-    def __init__(self, config: Dict[str, Any], logger: logging.Logger):
-        self.config = config
-        self.logger = logger
+    name = "openai"
+    
+    def __init__(self, config: Dict[str, Any], logger: logging.Logger, tracer: Optional[Tracer] = None):
+        super().__init__(config, logger, tracer)
         
         oai_key = os.getenv('OPENAI_API_KEY')
         if not oai_key:
             raise RuntimeError("OPENAI_API_KEY環境変数が設定されていません")
         
         openai.api_key = oai_key
+        # generate_article has its own deadline-aware retry loop; SDK retries
+        # would repeat a timed-out request with the full timeout again.
+        self.client = openai.OpenAI(api_key=oai_key, max_retries=0)
         self.model = config.get('openai', {}).get('model', 'o4-mini')
         self.temperature = config.get('openai', {}).get('temperature', 0.7)
         self.max_completion_tokens = config.get('openai', {}).get('max_tokens', 1000)
+        self.auto_max_tokens = config.get('openai', {}).get('auto_max_tokens', True)
+        self.token_safety_margin = config.get('openai', {}).get('token_safety_margin', 1.3)
+        self.max_tokens_limit = config.get('openai', {}).get('max_tokens_limit', 16000)
+        self.token_stats = TokenUsageStats(
+            config.get('openai', {}).get('token_stats_path', 'token_stats.json'),
+            logger
+        )
+        article_length = config.get('prompt_settings', {}).get('article_length', {})
+        self.target_chars = article_length.get('sections', 3) * article_length.get('words_per_section', 300)
         self.max_retries = config.get('processing', {}).get('retry_attempts', 3)
         self.retry_delay = config.get('processing', {}).get('retry_delay', 1.0)
     
-    def generate_article(self, prompt: str, title: str) -> Optional[str]:
-        """Generate article content using OpenAI API."""
+    def generate_article(
+        self,
+        prompt: str,
+        title: str,
+        deadline: Optional[float] = None,
+        abort_event: Optional[threading.Event] = None
+    ) -> Optional[str]:
+        """Generate article content using OpenAI API.
+        
+        Args:
+            deadline: ``time.monotonic()`` value after which no further
+                request or retry is made; also bounds each request's timeout.
+            abort_event: When set, pending retries are abandoned.
+        
+        Raises:
+            TimeoutError: If ``deadline`` passes before an article is produced.
+        """
         formatted_prompt = prompt.format(title=title)
+        sizing = 'auto' if self.auto_max_tokens else 'fixed'
+        max_completion_tokens = self._initial_max_tokens()
         
         for attempt in range(1, self.max_retries + 1):
+            if abort_event is not None and abort_event.is_set():
+                self.logger.info(f"中断要求により記事生成を停止しました: {title}")
+                return None
+            
+            request_options = {}
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.logger.warning(f"制限時間を超過したため記事生成を停止しました: {title}")
+                    raise TimeoutError(f"制限時間を超過しました: {title}")
+                request_options['timeout'] = remaining
+            
+            attempt_span = self.tracer.start_span(
+                'attempt',
+                title=title,
+                attempt=attempt,
+                max_completion_tokens=max_completion_tokens
+            )
+            
             try:
                 self.logger.debug(f"OpenAI API呼び出し (試行 {attempt}): {title}")
                 
-                response = openai.chat.completions.create(
+                response = self.client.chat.completions.create(
                     model=self.model,
                     messages=[
                         {
@@ -45,10 +99,36 @@ class OpenAIClient:
                             "content": formatted_prompt
                         }
                     ],
-                    max_completion_tokens=self.max_completion_tokens
+                    max_completion_tokens=max_completion_tokens,
+                    **request_options
                 )
+                self.tracer.add_event('response_received', span=attempt_span, title=title)
                 
                 content = response.choices[0].message.content
+                truncated = response.choices[0].finish_reason == 'length'
+                completion_tokens = self._record_usage(response, content, truncated)
+                self.tracer.end_span(
+                    attempt_span,
+                    finish_reason=response.choices[0].finish_reason,
+                    output_chars=len(content) if content else 0
+                )
+                
+                if truncated and self.auto_max_tokens and attempt < self.max_retries \
+                        and max_completion_tokens < self.max_tokens_limit:
+                    max_completion_tokens = min(max_completion_tokens * 2, self.max_tokens_limit)
+                    self.logger.warning(
+                        f"トークン上限で応答が切り詰められました。上限を {max_completion_tokens} に増やして再試行します: {title}"
+                    )
+                    continue
+                
+                self._record_outcome(sizing, truncated, max_completion_tokens, completion_tokens)
+                
+                if truncated:
+                    self.logger.warning(
+                        f"トークン上限 ({max_completion_tokens}) で応答が切り詰められたため記事生成失敗: {title}"
+                    )
+                    return None
+                
                 if content:
                     content = content.strip()
                     self.logger.debug(f"記事生成成功: {title} ({len(content)} 文字)")
@@ -59,20 +139,99 @@ class OpenAIClient:
                     
             except Exception as e:
                 error_type = type(e).__name__
+                self.tracer.end_span(attempt_span, error=f"{error_type}: {e}")
                 self.logger.warning(
                     f"API呼び出し失敗 (試行 {attempt}/{self.max_retries}): {title} - {error_type}: {e}"
                 )
                 
                 if attempt < self.max_retries:
                     delay = self.retry_delay * (2 ** (attempt - 1))  # Exponential backoff
+                    if deadline is not None and time.monotonic() + delay >= deadline:
+                        self.logger.warning(f"制限時間内に再試行できないため記事生成を停止しました: {title}")
+                        raise TimeoutError(f"制限時間を超過しました: {title}")
                     self.logger.info(f"{delay} 秒待機後に再試行します...")
-                    time.sleep(delay)
+                    with self.tracer.span('backoff', title=title, delay=delay):
+                        if abort_event is not None:
+                            if abort_event.wait(delay):
+                                self.logger.info(f"中断要求により記事生成を停止しました: {title}")
+                                return None
+                        else:
+                            time.sleep(delay)
                 else:
                     self.logger.error(f"最大試行回数に達しました。記事生成失敗: {title}")
                     return None
         
         return None
     
+    def _initial_max_tokens(self) -> int:
+        """Return max_completion_tokens for the first attempt."""
+        if not self.auto_max_tokens:
+            return self.max_completion_tokens
+        
+        return self.token_stats.estimate_max_tokens(
+            self.model,
+            self.target_chars,
+            self.token_safety_margin,
+            fallback=self.max_completion_tokens,
+            maximum=self.max_tokens_limit
+        )
+    
+    def _record_usage(self, response: Any, content: Optional[str], truncated: bool) -> Optional[int]:
+        """Record token usage reported by the API. Returns the completion tokens used."""
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return None
+        
+        details = getattr(usage, 'completion_tokens_details', None)
+        reasoning_tokens = getattr(details, 'reasoning_tokens', None) or 0
+        completion_tokens = usage.completion_tokens or 0
+        self.token_stats.record(
+            self.model,
+            output_chars=len(content.strip()) if content else 0,
+            completion_tokens=completion_tokens,
+            reasoning_tokens=reasoning_tokens,
+            truncated=truncated
+        )
+        return completion_tokens
+    
+    def _record_outcome(
+        self,
+        sizing: str,
+        truncated: bool,
+        max_completion_tokens: int,
+        completion_tokens: Optional[int]
+    ):
+        """Record whether an article ended truncated.
+        
+        With auto sizing, also records whether the configured ``max_tokens``
+        would have truncated the same article, as the ``fixed_baseline``
+        comparison. That is unknown when the article was cut off at a budget
+        below ``max_tokens`` or usage was not reported.
+        """
+        self.token_stats.record_outcome(self.model, sizing, truncated)
+        
+        if sizing != 'auto':
+            return
+        if truncated:
+            if max_completion_tokens >= self.max_completion_tokens:
+                self.token_stats.record_outcome(self.model, 'fixed_baseline', True)
+        elif completion_tokens is not None:
+            self.token_stats.record_outcome(
+                self.model,
+                'fixed_baseline',
+                completion_tokens > self.max_completion_tokens
+            )
+    
+    def save_stats(self):
+        """Persist token usage statistics and log truncation rates."""
+        self.token_stats.save()
+        
+        for sizing, rate in self.token_stats.truncation_rates(self.model).items():
+            self.logger.info(
+                f"トークン上限による切り詰め率 ({self.model}, {sizing}): "
+                f"{rate['rate']:.1%} ({rate['truncated']}/{rate['articles']} 件)"
+            )
+    
     def test_connection(self) -> bool:
         """Test OpenAI API connection."""
         try:
@@ -0,0 +1,265 @@
+"""Persistent index of generated articles in the output directory."""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime, date
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set
+
+from .utils import create_title_slug
+
+
+OUTPUT_FILENAME_PATTERN = re.compile(r'^(\d{8})_(.+)\.md$')
+
+
+class OutputIndex:
+    """Index of articles keyed by title.
+    
+    The index is stored as JSON in the output directory, so checking whether
+    a title already exists does not require listing the directory. Entries
+    hold the title, slug, date, filename, content hash and size of the most
+    recent article per title, and a slug to titles map detects titles that
+    would share a file name.
+    
+    Each recorded or dropped article is also appended to a journal file,
+    which is replayed on load, so the index stays current if a run is killed
+    before ``save`` writes the full snapshot.
+    """
+    
+    INDEX_FILENAME = ".blog_index.json"
+    JOURNAL_FILENAME = ".blog_index.journal"
+    FORMAT_VERSION = 2
+    
+    def __init__(self, output_dir: Path, logger: logging.Logger, rebuild: bool = False):
+        self.output_dir = Path(output_dir)
+        self.index_path = self.output_dir / self.INDEX_FILENAME
+        self.journal_path = self.output_dir / self.JOURNAL_FILENAME
+        self.logger = logger
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.untitled: Dict[str, Dict[str, Any]] = {}
+        self._slug_titles: Dict[str, Set[str]] = {}
+        
+        if rebuild or not self._load():
+            self.rebuild()
+    
+    def _load(self) -> bool:
+        """Load the index and replay the journal.
+        
+        Returns False if the index is missing, unreadable or in an older format.
+        """
+        if not self.index_path.exists():
+            return False
+        
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != self.FORMAT_VERSION:
+                return False
+            
+            self.entries = data['entries']
+            self.untitled = data['untitled']
+            
+            if self.journal_path.exists():
+                with open(self.journal_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            # A run killed mid-write can leave a partial last line.
+                            continue
+                        if entry.get('removed'):
+                            self._forget(entry)
+                        else:
+                            self.entries[entry['title']] = entry
+        except Exception as e:
+            self.logger.warning(f"出力インデックスの読み込みに失敗しました。再構築します: {e}")
+            return False
+        
+        self._slug_titles = {}
+        for title, entry in self.entries.items():
+            self._slug_titles.setdefault(entry['slug'], set()).add(title)
+        return True
+    
+    def rebuild(self):
+        """Rebuild the index by scanning the output directory.
+        
+        Only the first line of each article is read, to recover its
+        ``# title`` heading. Files whose heading does not match the slug in
+        their file name are indexed by slug alone.
+        """
+        entries: Dict[str, Dict[str, Any]] = {}
+        untitled: Dict[str, Dict[str, Any]] = {}
+        
+        if self.output_dir.is_dir():
+            with os.scandir(self.output_dir) as it:
+                for dir_entry in it:
+                    match = OUTPUT_FILENAME_PATTERN.match(dir_entry.name)
+                    if not match or not dir_entry.is_file():
+                        continue
+                    
+                    date_str, slug = match.groups()
+                    try:
+                        article_date = datetime.strptime(date_str, "%Y%m%d").date().isoformat()
+                    except ValueError:
+                        continue
+                    
+                    title = _read_title(Path(dir_entry.path))
+                    if title is not None and create_title_slug(title) != slug:
+                        title = None
+                    
+                    target = entries if title is not None else untitled
+                    key = title if title is not None else slug
+                    current = target.get(key)
+                    if current and current['date'] >= article_date:
+                        continue
+                    
+                    target[key] = {
+                        'title': title,
+                        'slug': slug,
+                        'date': article_date,
+                        'filename': dir_entry.name,
+                        'content_hash': None,
+                        'size': dir_entry.stat().st_size
+                    }
+        
+        with self._lock:
+            self.entries = entries
+            self.untitled = untitled
+            self._slug_titles = {}
+            for title, entry in entries.items():
+                self._slug_titles.setdefault(entry['slug'], set()).add(title)
+        
+        self.logger.info(f"出力インデックスを再構築しました: {len(entries) + len(untitled)} 件")
+        self.save()
+    
+    def save(self):
+        """Write the index file atomically and clear the journal."""
+        with self._lock:
+            data = json.dumps({
+                'version': self.FORMAT_VERSION,
+                'entries': self.entries,
+                'untitled': self.untitled
+            }, ensure_ascii=False)
+            
+            try:
+                self.output_dir.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+                tmp_path.write_text(data, encoding='utf-8')
+                tmp_path.replace(self.index_path)
+                if self.journal_path.exists():
+                    self.journal_path.unlink()
+            except Exception as e:
+                self.logger.warning(f"出力インデックスの保存に失敗しました: {e}")
+    
+    def lookup(self, title: str) -> Optional[Dict[str, Any]]:
+        """Return the index entry for ``title``, if any.
+        
+        Articles whose title could not be recovered are matched by slug.
+        """
+        with self._lock:
+            entry = self.entries.get(title)
+            if entry is None:
+                entry = self.untitled.get(create_title_slug(title))
+            return entry
+    
+    def colliding_titles(self, title: str) -> List[str]:
+        """Return other indexed titles that share the slug of ``title``."""
+        with self._lock:
+            titles = self._slug_titles.get(create_title_slug(title), set())
+            return sorted(t for t in titles if t != title)
+    
+    def lookup_existing(self, title: str) -> Optional[Dict[str, Any]]:
+        """Return the entry for ``title`` if its file is still on disk.
+        
+        Entries whose file was deleted or moved are dropped from the index.
+        """
+        entry = self.lookup(title)
+        if entry is None or (self.output_dir / entry['filename']).exists():
+            return entry
+        
+        self.logger.info(f"出力ファイルが存在しないためインデックスから削除しました: {entry['filename']}")
+        with self._lock:
+            self._forget(entry)
+            self._append_journal({'removed': True, 'title': entry['title'], 'slug': entry['slug']})
+        return None
+    
+    def _forget(self, entry: Dict[str, Any]):
+        """Remove an entry. Callers other than ``_load`` must hold the lock."""
+        title = entry.get('title')
+        if title is None:
+            self.untitled.pop(entry['slug'], None)
+            return
+        
+        self.entries.pop(title, None)
+        self._slug_titles.get(entry['slug'], set()).discard(title)
+    
+    def file_owner(self, title: str, filename: str) -> Optional[str]:
+        """Return another indexed title whose article is stored as ``filename``."""
+        with self._lock:
+            for other_title in self._slug_titles.get(create_title_slug(title), set()):
+                if other_title != title and self.entries[other_title]['filename'] == filename:
+                    return other_title
+            return None
+    
+    def age_days(self, title: str, today: Optional[date] = None) -> Optional[int]:
+        """Return the age in days of the indexed article for ``title``."""
+        entry = self.lookup(title)
+        if entry is None:
+            return None
+        
+        if today is None:
+            today = date.today()
+        return (today - date.fromisoformat(entry['date'])).days
+    
+    def record(self, title: str, output_file: Path, content: str, article_date: Optional[date] = None):
+        """Record a written article and append it to the journal."""
+        if article_date is None:
+            article_date = date.today()
+        
+        encoded = content.encode('utf-8')
+        slug = create_title_slug(title)
+        entry = {
+            'title': title,
+            'slug': slug,
+            'date': article_date.isoformat(),
+            'filename': Path(output_file).name,
+            'content_hash': hashlib.sha256(encoded).hexdigest(),
+            'size': len(encoded)
+        }
+        
+        with self._lock:
+            self.entries[title] = entry
+            self._slug_titles.setdefault(slug, set()).add(title)
+            untitled = self.untitled.get(slug)
+            if untitled and untitled['filename'] == entry['filename']:
+                del self.untitled[slug]
+            
+            self._append_journal(entry)
+    
+    def _append_journal(self, record: Dict[str, Any]):
+        """Append a record to the journal. Callers must hold the lock."""
+        try:
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        except Exception as e:
+            self.logger.warning(f"出力インデックスのジャーナル書き込みに失敗しました: {e}")
+
+
+def _read_title(path: Path) -> Optional[str]:
+    """Return the ``# title`` heading on the first line of an article."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            first_line = f.readline(1024).strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+    
+    if first_line.startswith('# '):
+        return first_line[2:].strip() or None
+    return None
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""Token usage statistics for sizing max_completion_tokens."""
+
+import json
+import math
+import threading
+import logging
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+class TokenUsageStats:
+    """Tracks observed chars/token and reasoning-token usage per model.
+    
+    Statistics are persisted as JSON so that estimates carry over between
+    runs. Usage samples are recorded per API response, while truncation is
+    counted per article under a sizing mode: ``fixed`` (configured
+    ``max_tokens``), ``auto`` (estimated), and ``fixed_baseline``, whether
+    ``max_tokens`` would have truncated the articles generated with ``auto``.
+    """
+    
+    DEFAULT_CHARS_PER_TOKEN = 1.0
+    MIN_SAMPLES = 3
+    
+    def __init__(self, path: Optional[str], logger: logging.Logger):
+        self.path = Path(path) if path else None
+        self.logger = logger
+        self._lock = threading.Lock()
+        self.stats = self._load()
+    
+    def _load(self) -> Dict[str, Any]:
+        """Load statistics from file, ignoring unreadable files."""
+        if self.path is None or not self.path.exists():
+            return {}
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"トークン統計ファイルの読み込みに失敗しました: {e}")
+            return {}
+    
+    def save(self):
+        """Save statistics to file."""
+        if self.path is None:
+            return
+        
+        with self._lock:
+            data = json.dumps(self.stats, ensure_ascii=False, indent=2)
+        
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            tmp_path.write_text(data, encoding='utf-8')
+            tmp_path.replace(self.path)
+        except Exception as e:
+            self.logger.warning(f"トークン統計ファイルの保存に失敗しました: {e}")
+    
+    def _model_stats(self, model: str) -> Dict[str, Any]:
+        return self.stats.setdefault(model, {
+            'samples': 0,
+            'output_chars': 0,
+            'output_tokens': 0,
+            'reasoning_tokens': 0,
+            'outcomes': {}
+        })
+    
+    def record(
+        self,
+        model: str,
+        output_chars: int,
+        completion_tokens: int,
+        reasoning_tokens: int,
+        truncated: bool
+    ):
+        """Record the usage of a single completion."""
+        with self._lock:
+            model_stats = self._model_stats(model)
+            
+            # Truncated responses understate the tokens the article needed.
+            output_tokens = completion_tokens - reasoning_tokens
+            if truncated or output_chars <= 0 or output_tokens <= 0:
+                return
+            
+            model_stats['samples'] += 1
+            model_stats['output_chars'] += output_chars
+            model_stats['output_tokens'] += output_tokens
+            model_stats['reasoning_tokens'] += reasoning_tokens
+    
+    def estimate_max_tokens(
+        self,
+        model: str,
+        target_chars: int,
+        safety_margin: float,
+        fallback: int,
+        maximum: int
+    ) -> int:
+        """Estimate max_completion_tokens for an article of ``target_chars``.
+        
+        Until enough untruncated samples exist for ``model``, the estimate is
+        never lower than ``fallback``.
+        """
+        with self._lock:
+            model_stats = self.stats.get(model)
+            if model_stats and model_stats['samples'] >= self.MIN_SAMPLES:
+                chars_per_token = model_stats['output_chars'] / model_stats['output_tokens']
+                reasoning = model_stats['reasoning_tokens'] / model_stats['samples']
+                minimum = 1
+            else:
+                chars_per_token = self.DEFAULT_CHARS_PER_TOKEN
+                reasoning = 0
+                minimum = fallback
+        
+        estimate = math.ceil((target_chars / chars_per_token + reasoning) * safety_margin)
+        return max(minimum, min(estimate, maximum))
+    
+    def record_outcome(self, model: str, sizing: str, truncated: bool):
+        """Record whether an article ended truncated under ``sizing``."""
+        with self._lock:
+            outcomes = self._model_stats(model).setdefault('outcomes', {})
+            counts = outcomes.setdefault(sizing, {'articles': 0, 'truncated': 0})
+            counts['articles'] += 1
+            if truncated:
+                counts['truncated'] += 1
+    
+    def truncation_rates(self, model: str) -> Dict[str, Dict[str, float]]:
+        """Return article counts and truncation rate per sizing mode."""
+        with self._lock:
+            outcomes = self.stats.get(model, {}).get('outcomes', {})
+            return {
+                mode: {
+                    'articles': counts['articles'],
+                    'truncated': counts['truncated'],
+                    'rate': counts['truncated'] / counts['articles'] if counts['articles'] else 0.0
+                }
+                for mode, counts in outcomes.items()
+            }
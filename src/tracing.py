@@ -0,0 +1,291 @@
+"""Span tracing for BlogAutoWriter runs."""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterator
+
+
+class Span:
+    """A timed operation with attributes and point-in-time events."""
+    
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        span_id: str,
+        parent_id: Optional[str],
+        start_ns: int,
+        attributes: Dict[str, Any]
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start_ns = start_ns
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.events: List[Dict[str, Any]] = []
+        self.thread_id = threading.get_ident()
+        self.thread_name = threading.current_thread().name
+        self.end_thread_id: Optional[int] = None
+    
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+
+class Tracer:
+    """Records spans and exports them as Chrome trace events or OTLP JSON.
+    
+    The current span is tracked per thread, so spans started without an
+    explicit parent nest under whatever span the calling thread is in. When
+    disabled, spans are still handed out but never recorded.
+    """
+    
+    def __init__(self, enabled: bool = True, service_name: str = "BlogAutoWriter"):
+        self.enabled = enabled
+        self.service_name = service_name
+        self.trace_id = os.urandom(16).hex()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._open: Dict[str, Span] = {}
+        self._finished: List[Span] = []
+        self._epoch_ns = time.time_ns()
+        self._perf_ns = time.perf_counter_ns()
+    
+    def _now_ns(self) -> int:
+        return self._epoch_ns + time.perf_counter_ns() - self._perf_ns
+    
+    def _stack(self) -> List[Span]:
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+    
+    def current_span(self) -> Optional[Span]:
+        stack = self._stack()
+        return stack[-1] if stack else None
+    
+    def start_span(self, name: str, parent: Optional[Span] = None, **attributes) -> Span:
+        """Start a span under ``parent`` or the current span of this thread."""
+        if parent is None:
+            parent = self.current_span()
+        
+        span = Span(
+            name,
+            self.trace_id,
+            os.urandom(8).hex(),
+            parent.span_id if parent else None,
+            self._now_ns(),
+            attributes
+        )
+        
+        if self.enabled:
+            with self._lock:
+                self._open[span.span_id] = span
+        
+        return span
+    
+    def end_span(self, span: Span, **attributes):
+        """End a span. Ending an already finished span does nothing."""
+        if span.end_ns is not None:
+            return
+        
+        span.attributes.update(attributes)
+        span.end_ns = self._now_ns()
+        span.end_thread_id = threading.get_ident()
+        
+        if self.enabled:
+            with self._lock:
+                if self._open.pop(span.span_id, None) is not None:
+                    self._finished.append(span)
+    
+    def add_event(self, name: str, span: Optional[Span] = None, **attributes):
+        """Add an event to ``span`` or the current span of this thread."""
+        if span is None:
+            span = self.current_span()
+        if span is None or not self.enabled:
+            return
+        
+        span.events.append({
+            'name': name,
+            'time_ns': self._now_ns(),
+            'thread_id': threading.get_ident(),
+            'attributes': attributes
+        })
+    
+    @contextmanager
+    def use_span(self, span: Span) -> Iterator[Span]:
+        """Make ``span`` current in this thread without ending it."""
+        stack = self._stack()
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            stack.pop()
+    
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        """Start a span, make it current and end it on exit."""
+        span = self.start_span(name, **attributes)
+        try:
+            with self.use_span(span):
+                yield span
+        except BaseException as e:
+            span.set_attribute('error', f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            self.end_span(span)
+    
+    def end_open_spans(self, **attributes):
+        """End every span still open, e.g. for titles cancelled before dispatch."""
+        with self._lock:
+            spans = list(self._open.values())
+        
+        for span in spans:
+            self.end_span(span, **attributes)
+    
+    def finished_spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._finished)
+    
+    def export_chrome(self, path: Path):
+        """Write spans in Chrome trace-event JSON format.
+        
+        Spans that end on a different thread than they started on (such as
+        ``queued``) are written as async events so they do not break the
+        nesting of the thread they started on. Events are placed on the
+        thread that recorded them.
+        """
+        pid = os.getpid()
+        spans = self.finished_spans()
+        trace_events = []
+        threads = {}
+        
+        for span in spans:
+            threads[span.thread_id] = span.thread_name
+            args = dict(span.attributes)
+            args['span_id'] = span.span_id
+            if span.parent_id:
+                args['parent_id'] = span.parent_id
+            
+            start_ts = (span.start_ns - self._epoch_ns) / 1000
+            end_ts = (span.end_ns - self._epoch_ns) / 1000
+            
+            if span.end_thread_id == span.thread_id:
+                trace_events.append({
+                    'name': span.name,
+                    'cat': 'blog_auto_writer',
+                    'ph': 'X',
+                    'ts': start_ts,
+                    'dur': end_ts - start_ts,
+                    'pid': pid,
+                    'tid': span.thread_id,
+                    'args': args
+                })
+            else:
+                for phase, ts in (('b', start_ts), ('e', end_ts)):
+                    trace_events.append({
+                        'name': span.name,
+                        'cat': 'blog_auto_writer',
+                        'ph': phase,
+                        'id': span.span_id,
+                        'ts': ts,
+                        'pid': pid,
+                        'tid': span.thread_id,
+                        'args': args
+                    })
+            
+            for event in span.events:
+                trace_events.append({
+                    'name': event['name'],
+                    'cat': 'blog_auto_writer',
+                    'ph': 'i',
+                    's': 't',
+                    'ts': (event['time_ns'] - self._epoch_ns) / 1000,
+                    'pid': pid,
+                    'tid': event['thread_id'],
+                    'args': dict(event['attributes'], span_id=span.span_id)
+                })
+        
+        for thread_id, thread_name in threads.items():
+            trace_events.append({
+                'name': 'thread_name',
+                'ph': 'M',
+                'pid': pid,
+                'tid': thread_id,
+                'args': {'name': thread_name}
+            })
+        
+        self._write_json(path, {'traceEvents': trace_events, 'displayTimeUnit': 'ms'})
+    
+    def export_otlp(self, path: Path):
+        """Write spans in OpenTelemetry OTLP/JSON format."""
+        otlp_spans = []
+        
+        for span in self.finished_spans():
+            attributes = dict(span.attributes, **{'thread.id': span.thread_id, 'thread.name': span.thread_name})
+            otlp_span = {
+                'traceId': span.trace_id,
+                'spanId': span.span_id,
+                'name': span.name,
+                'kind': 1,
+                'startTimeUnixNano': str(span.start_ns),
+                'endTimeUnixNano': str(span.end_ns),
+                'attributes': _otlp_attributes(attributes),
+                'events': [
+                    {
+                        'timeUnixNano': str(event['time_ns']),
+                        'name': event['name'],
+                        'attributes': _otlp_attributes(
+                            dict(event['attributes'], **{'thread.id': event['thread_id']})
+                        )
+                    }
+                    for event in span.events
+                ]
+            }
+            if span.parent_id:
+                otlp_span['parentSpanId'] = span.parent_id
+            if span.attributes.get('error'):
+                otlp_span['status'] = {'code': 2, 'message': str(span.attributes['error'])}
+            otlp_spans.append(otlp_span)
+        
+        self._write_json(path, {
+            'resourceSpans': [{
+                'resource': {
+                    'attributes': _otlp_attributes({'service.name': self.service_name})
+                },
+                'scopeSpans': [{
+                    'scope': {'name': 'blog_auto_writer'},
+                    'spans': otlp_spans
+                }]
+            }]
+        })
+    
+    def _write_json(self, path: Path, data: Dict[str, Any]):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Convert a dict to a list of OTLP key/value attributes."""
+    result = []
+    
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            otlp_value = {'boolValue': value}
+        elif isinstance(value, int):
+            otlp_value = {'intValue': str(value)}
+        elif isinstance(value, float):
+            otlp_value = {'doubleValue': value}
+        else:
+            otlp_value = {'stringValue': str(value)}
+        result.append({'key': key, 'value': otlp_value})
+    
+    return result